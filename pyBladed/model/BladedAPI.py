@@ -1,14 +1,62 @@
 """
 This file contains methods to setup and run Bladed .prj files
 """
-import clr  # part of the pythonnet package
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# load library
-clr.AddReference('GH.Bladed.Api.Facades')  # This loads the dll which provides the Bladed API into Python
-from GH.Bladed.Api.Facades.EntryPoint import Bladed  # This imports the entry point to the Bladed API into this script
-from GH.Bladed.DataModel import Facades  # This provides the enum "look up codes" for things like "TurbulentWind"
+# The Bladed API is loaded on first use (see _ensure_loaded), as loading it takes several seconds.
+Bladed = None  # entry point to the Bladed API
+Facades = None  # provides the enum "look up codes" for things like "TurbulentWind"
+# string identifiers of the calculation types supported by BladedModel.set_calculation_type
+_SIM_TYPE_MAP = None
+
+
+def _ensure_loaded():
+    """
+    Loads the Bladed API library, if not done yet.
+    """
+    global Bladed, Facades, _SIM_TYPE_MAP
+    if Bladed is not None:
+        return
+    import clr  # part of the pythonnet package
+    clr.AddReference('GH.Bladed.Api.Facades')  # This loads the dll which provides the Bladed API into Python
+    from GH.Bladed.Api.Facades.EntryPoint import Bladed as entry_point
+    from GH.Bladed.DataModel import Facades as facades
+    _SIM_TYPE_MAP = {
+        'modal_analysis': facades.SimulationTypeEnumFacade.ModalAnalysis,
+        'wind_turbulence': facades.SimulationTypeEnumFacade.WindTurbulence,
+        'earthquake_generation': facades.SimulationTypeEnumFacade.EarthquakeGeneration,
+        'sea_state': facades.SimulationTypeEnumFacade.SeaState,
+        'aerodynamic_information': facades.SimulationTypeEnumFacade.AerodynamicInformation,
+        'performance_coefficients': facades.SimulationTypeEnumFacade.PerformanceCoefficients,
+        'steady_power_curve': facades.SimulationTypeEnumFacade.SteadyPowerCurve,
+        'steady_operational_loads': facades.SimulationTypeEnumFacade.SteadyOperationalLoads,
+        'steady_parked_loads': facades.SimulationTypeEnumFacade.SteadyParkedLoads,
+        'model_linearisation': facades.SimulationTypeEnumFacade.ModelLinearisation,
+        'electrical_performance': facades.SimulationTypeEnumFacade.ElectricalPerformance,
+        'power_production_loading': facades.SimulationTypeEnumFacade.PowerProduction,
+        'normal_stop': facades.SimulationTypeEnumFacade.NormalStop,
+        'emergency_stop': facades.SimulationTypeEnumFacade.EmergencyStop,
+        'start': facades.SimulationTypeEnumFacade.Start,
+        'idling': facades.SimulationTypeEnumFacade.Idling,
+        'parked': facades.SimulationTypeEnumFacade.Parked,
+        'hardware_test': facades.SimulationTypeEnumFacade.HardwareTest,
+    }
+    Facades = facades
+    Bladed = entry_point
+
+
+# single worker: the batch framework runs one batch at a time
+_batch_executor = ThreadPoolExecutor(max_workers=1)
+
+
+def _run_blocking():
+    """
+    Runs the batch and reports whether it has completed successfully.
+    """
+    Bladed.BatchApi.RunBlocking()
+    return Bladed.BatchApi.HasCompleted()
 
 
 class BladedModel:
@@ -26,8 +74,12 @@ class BladedModel:
         has_batch: Boolean
             Flag to indicate whether batch process has to be initialized
         """
+        _ensure_loaded()
         self.suppress_logs()
         self.prj = self.get_project(project_file_path)
+        # resolved lazily, see turbulent_wind and turbulence_generation
+        self._turb_wind = None
+        self._turb_gen = None
         if not has_batch:
             self.setup_batch()
 
@@ -36,6 +88,7 @@ class BladedModel:
         """
         Disable console logging.
         """
+        _ensure_loaded()
         Bladed.LoggingSettings.LogToConsole = False
         Bladed.LoggingSettings.DisableDebugLogs()
         Bladed.LoggingSettings.SuppressBladedM72Logs = True
@@ -53,6 +106,7 @@ class BladedModel:
         -------
         BladedProject instance
         """
+        _ensure_loaded()
         prj_template = Bladed.ProjectApi.GetProject(project_file_path)
         prj = prj_template.Clone()
         return prj
@@ -67,6 +121,7 @@ class BladedModel:
         batch_directory: str
             Path of the directory to be used in the batch run, defaults to a local temp folder.
         """
+        _ensure_loaded()
         Bladed.BatchApi.StartFramework()
         Bladed.BatchApi.SetDirectory(batch_directory)
         Bladed.BatchApi.SetJobList('default')
@@ -76,12 +131,45 @@ class BladedModel:
         """
         Starts a batch computation.
         """
+        _ensure_loaded()
         Bladed.BatchApi.RunBlocking()
         if Bladed.BatchApi.HasCompleted():
             print('Batch runs have completed successfully.')
         else:
             print('Batch runs have not completed successfully.')
 
+    @staticmethod
+    def run_batch_async():
+        """
+        Starts a batch computation in a background thread. The Python side is free to prepare
+        further models while Bladed is computing.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Resolves to True if the batch runs have completed successfully.
+        """
+        _ensure_loaded()
+        return _batch_executor.submit(_run_blocking)
+
+    @staticmethod
+    def as_completed(futures, timeout=None):
+        """
+        Iterates over batch runs started with run_batch_async() as they finish.
+
+        Parameters
+        ----------
+        futures: iterable
+            Futures returned by run_batch_async()
+        timeout: float, default=None
+            Maximum number of seconds to wait, no limit if None
+
+        Returns
+        -------
+        iterator yielding the futures in order of completion
+        """
+        return as_completed(futures, timeout=timeout)
+
     def run_simulation(self, result_directory=os.path.join(tempfile.gettempdir(), r'model', r'Results'),
                        prefix='bladed_api_run'):
         """
@@ -102,6 +190,22 @@ class BladedModel:
         """
         Adds the current project calculation to the batch
 
+        Parameters
+        ----------
+        result_directory: str
+            Path of directory the results are written to
+        prefix: str
+            Prefix for output files
+        """
+        self.queue_only(result_directory, prefix)
+        Bladed.ProjectApi.AddQueuedJobsToBatch()
+
+    def queue_only(self, result_directory=os.path.join(tempfile.gettempdir(), r'model', r'Results'),
+                   prefix='bladed_api_run'):
+        """
+        Queues the current project calculation without adding it to the batch.
+        Use flush_and_run() to submit all queued jobs at once.
+
         Parameters
         ----------
         result_directory: str
@@ -110,7 +214,29 @@ class BladedModel:
             Prefix for output files
         """
         Bladed.ProjectApi.QueueJob(self.prj, result_directory, prefix)
+
+    @classmethod
+    def flush_and_run(cls):
+        """
+        Adds all queued jobs to the batch and starts a single batch computation.
+        """
+        _ensure_loaded()
         Bladed.ProjectApi.AddQueuedJobsToBatch()
+        cls.run_batch()
+
+    @classmethod
+    def run_simulations_bulk(cls, jobs):
+        """
+        Executes several simulations in one batch run.
+
+        Parameters
+        ----------
+        jobs: iterable
+            Tuples of (BladedModel, result_directory, prefix), one per simulation
+        """
+        for model, result_directory, prefix in jobs:
+            model.queue_only(result_directory, prefix)
+        cls.flush_and_run()
 
     def modify_blade(self, blade_data):
         """
@@ -138,25 +264,53 @@ class BladedModel:
                         shearStiffnessXp
                         shearStiffnessYp
         """
-        blade = self.prj.LegacyModel.BladeMB.BladeStations  # just to make code cleaner
-        for param in blade_data:
+        # every attribute or indexer access below crosses the pythonnet bridge, so the station objects
+        # are collected once and their property objects are fetched only once per section
+        stations = list(self.prj.LegacyModel.BladeMB.BladeStations)
+        # plain Python numbers are converted much faster by pythonnet than numpy scalars
+        blade_data = {param: (values.tolist() if hasattr(values, 'tolist') else list(values))
+                      for param, values in blade_data.items()}
+        for param, values in blade_data.items():
+            if len(values) > len(stations):
+                raise ValueError('More values than blade stations given for "' + param + '"')
             if '.' in param:
                 # special cases: CentreOfMass.X, CentreOfMass.Y, ShearCentre.X, ShearCentre.Y
-                for sect, param_value in enumerate(blade_data[param]):
+                attr_head, axis = param[:-2], param[-1]
+                for station, param_value in zip(stations, values):
+                    ib = station.InboardProperties
+                    ob = station.OutboardProperties
                     # INBOARD
-                    cpoint = getattr(blade[sect].InboardProperties, param[:-2])
-                    setattr(cpoint, param[-1], param_value)
-                    setattr(blade[sect].InboardProperties, param[:-2], cpoint)
+                    cpoint = getattr(ib, attr_head)
+                    setattr(cpoint, axis, param_value)
+                    setattr(ib, attr_head, cpoint)
                     # OUTBOARD
-                    cpoint = getattr(blade[sect].OutboardProperties, param[:-2])
-                    setattr(cpoint, param[-1], param_value)
-                    setattr(blade[sect].OutboardProperties, param[:-2], cpoint)
+                    cpoint = getattr(ob, attr_head)
+                    setattr(cpoint, axis, param_value)
+                    setattr(ob, attr_head, cpoint)
             else:
-                for sect, param_value in enumerate(blade_data[param]):
+                for station, param_value in zip(stations, values):
                     # INBOARD
-                    setattr(blade[sect].InboardProperties, param, param_value)
+                    setattr(station.InboardProperties, param, param_value)
                     # OUTBOARD
-                    setattr(blade[sect].OutboardProperties, param, param_value)
+                    setattr(station.OutboardProperties, param, param_value)
+
+    @property
+    def turbulent_wind(self):
+        """
+        Turbulent wind definition of the prj (cached to avoid walking the CLR object tree on every access).
+        """
+        if self._turb_wind is None:
+            self._turb_wind = self.prj.Environment.Wind.TimeVaryingWind.TurbulentWind
+        return self._turb_wind
+
+    @property
+    def turbulence_generation(self):
+        """
+        Turbulence generation settings of the prj (cached to avoid walking the CLR object tree on every access).
+        """
+        if self._turb_gen is None:
+            self._turb_gen = self.prj.PreProcessing.TurbulenceGeneration
+        return self._turb_gen
 
     def set_calculation_type(self, calculation_type='power_production'):
         """
@@ -167,46 +321,14 @@ class BladedModel:
         calculation_type: str, default='power_production'
             string identifier for the desired calculation type.
         """
-        # Changing the calculation type to "Wind Turbulence"
-        if calculation_type == 'modal_analysis':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.ModalAnalysis
-        elif calculation_type == 'wind_turbulence':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.WindTurbulence
-        elif calculation_type == 'earthquake_generation':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.EarthquakeGeneration
-        elif calculation_type == 'sea_state':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.SeaState
-        elif calculation_type == 'aerodynamic_information':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.AerodynamicInformation
-        elif calculation_type == 'performance_coefficients':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.PerformanceCoefficients
-        elif calculation_type == 'steady_power_curve':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.SteadyPowerCurve
-        elif calculation_type == 'steady_operational_loads':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.SteadyOperationalLoads
-        elif calculation_type == 'steady_parked_loads':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.SteadyParkedLoads
-        elif calculation_type == 'model_linearisation':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.ModelLinearisation
-        elif calculation_type == 'electrical_performance':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.ElectricalPerformance
-        elif calculation_type == 'power_production_loading':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.PowerProduction
-        elif calculation_type == 'normal_stop':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.NormalStop
-        elif calculation_type == 'emergency_stop':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.EmergencyStop
-        elif calculation_type == 'start':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.Start
-        elif calculation_type == 'idling':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.Idling
-        elif calculation_type == 'parked':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.Parked
-        elif calculation_type == 'hardware_test':
-            self.prj.Simulation.SimulationType = Facades.SimulationTypeEnumFacade.HardwareTest
-        else:
+        try:
+            self.prj.Simulation.SimulationType = _SIM_TYPE_MAP[calculation_type]
+        except KeyError:
             raise NotImplementedError('Requested simulation type can not be set (from this function). '
                                       'Check self.prj.Simulation.SimulationType for all calculation options')
+        # the cached definitions may be replaced by Bladed when the calculation type changes
+        self._turb_wind = None
+        self._turb_gen = None
 
     def set_turbulence_settings(self, num_points_y=None, num_points_z=None, volume_width_y=None, volume_width_z=None,
                            duration_wind_file=None, frequency_along_x=None, mean_wind_speed=None, turbulence_seed=None):
@@ -237,22 +359,23 @@ class BladedModel:
         # using the desired Spectrum Type
 
         # Modify the turbulent wind definition as necessary
+        turbulence_generation = self.turbulence_generation
         if num_points_y is not None:
-            self.prj.PreProcessing.TurbulenceGeneration.NumPointsY = num_points_y
+            turbulence_generation.NumPointsY = num_points_y
         if num_points_z is not None:
-            self.prj.PreProcessing.TurbulenceGeneration.NumPointsZ = num_points_z
+            turbulence_generation.NumPointsZ = num_points_z
         if volume_width_y is not None:
-            self.prj.PreProcessing.TurbulenceGeneration.VolumeWidthY = volume_width_y
+            turbulence_generation.VolumeWidthY = volume_width_y
         if volume_width_z is not None:
-            self.prj.PreProcessing.TurbulenceGeneration.VolumeWidthZ = volume_width_z
+            turbulence_generation.VolumeWidthZ = volume_width_z
         if duration_wind_file is not None:
-            self.prj.PreProcessing.TurbulenceGeneration.Duration = duration_wind_file
+            turbulence_generation.Duration = duration_wind_file
         if frequency_along_x is not None:
-            self.prj.PreProcessing.TurbulenceGeneration.FrequencyAlongX = frequency_along_x
+            turbulence_generation.FrequencyAlongX = frequency_along_x
         if mean_wind_speed is not None:
-            self.prj.PreProcessing.TurbulenceGeneration.MeanSpeed = mean_wind_speed
+            turbulence_generation.MeanSpeed = mean_wind_speed
         if turbulence_seed is not None:
-            self.prj.PreProcessing.TurbulenceGeneration.TurbulenceSeed = turbulence_seed
+            turbulence_generation.TurbulenceSeed = turbulence_seed
 
     def set_turbulent_wind(self, turbulent_wind_filepath=None, mean_wind_speed=None, ti_u=None, ti_v=None, ti_w=None,
                            direction=None, inclination=None, refer_to_hub=None):
@@ -282,27 +405,31 @@ class BladedModel:
         """
 
         # Changing the wind model to "turbulent wind"
-        self.prj.Environment.Wind.TimeVaryingWind.ModelType = Facades.WindModelEnumFacade.TurbulentWind
+        time_varying_wind = self.prj.Environment.Wind.TimeVaryingWind
+        if time_varying_wind.ModelType != Facades.WindModelEnumFacade.TurbulentWind:
+            time_varying_wind.ModelType = Facades.WindModelEnumFacade.TurbulentWind
+            self._turb_wind = None
 
         # Setting all of the turbulent wind parameters
+        turbulent_wind = self.turbulent_wind
         if turbulent_wind_filepath is not None:
             assert os.path.exists(turbulent_wind_filepath), "Wind file {} does not exist".format(
                 turbulent_wind_filepath)
-            self.prj.Environment.Wind.TimeVaryingWind.TurbulentWind.WindFile = turbulent_wind_filepath
+            turbulent_wind.WindFile = turbulent_wind_filepath
         if mean_wind_speed is not None:
-            self.prj.Environment.Wind.TimeVaryingWind.TurbulentWind.MeanSpeed = mean_wind_speed
+            turbulent_wind.MeanSpeed = mean_wind_speed
         if ti_u is not None:
-            self.prj.Environment.Wind.TimeVaryingWind.TurbulentWind.TI_U = ti_u
+            turbulent_wind.TI_U = ti_u
         if ti_v is not None:
-            self.prj.Environment.Wind.TimeVaryingWind.TurbulentWind.TI_V = ti_v
+            turbulent_wind.TI_V = ti_v
         if ti_w is not None:
-            self.prj.Environment.Wind.TimeVaryingWind.TurbulentWind.TI_W = ti_w
+            turbulent_wind.TI_W = ti_w
         if direction is not None:
-            self.prj.Environment.Wind.TimeVaryingWind.TurbulentWind.Direction = direction
+            turbulent_wind.Direction = direction
         if inclination is not None:
-            self.prj.Environment.Wind.TimeVaryingWind.TurbulentWind.Inclination = inclination
+            turbulent_wind.Inclination = inclination
         if refer_to_hub is not None:
-            self.prj.Environment.Wind.TimeVaryingWind.TurbulentWind.ReferToHub = refer_to_hub
+            turbulent_wind.ReferToHub = refer_to_hub
 
     def modify_simulation_parameter(self, simulation_parameter_data):
         """
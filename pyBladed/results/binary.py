@@ -7,9 +7,73 @@ import os
 import re
 import numpy as np
 import glob
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 from pyBladed.results import bladed_definitions
 
+# header line: keyword and (non-empty) rest of the line, separated by any whitespace (leading whitespace is ignored,
+# as with str.split), other lines match without groups
+# (each match consumes a full line, so the search does not have to try every position within a line)
+_HEADER_LINE_PATTERN = re.compile(r'^(?:[^\S\n]*(\S+)[^\S\n]+(\S.*)|.*)\n?', re.MULTILINE)
+
+# names enclosed by '' (e.g. in VARIAB lines)
+_NAME_PATTERN = re.compile(r"'([\w\s\-()/.]+)'")
+
+# Bladed number formats and the corresponding numpy data types (prebuilt, so numpy does not parse them on each load)
+_NUMPY_DTYPE = {
+    'R*4': np.dtype('<f4'),
+    'R4': np.dtype('<f4'),
+    'R*8': np.dtype('<f8'),
+    'I*4': np.dtype('<i4'),
+}
+
+
+def _to_numpy_dtype(rest):
+    """
+    Translates a Bladed number format (e.g. R*4) into a numpy data type.
+    """
+    try:
+        return _NUMPY_DTYPE[rest]
+    except KeyError:
+        raise ValueError('Unknown type in Bladed header: ' + rest)
+
+
+# int header values (RECL, NDIMENS, AXIMETH, NVARS, ...) are nearly always small, a lookup is cheaper than parsing
+_SMALL_INT = {str(i): i for i in range(-128, 256)}
+
+
+def _to_int(rest):
+    """
+    Converts an int header value, using the lookup table for small values.
+    """
+    value = _SMALL_INT.get(rest)
+    return int(rest) if value is None else value
+
+
+# conversion methods (as used in bladed_definitions.py) and how they are applied to the value part of a header line
+_HEADER_PARSERS = {
+    'string': lambda rest: rest,
+    'string-remove': lambda rest: rest.replace("'", ""),
+    'string-list': lambda rest: rest.split(' '),
+    'string-list-remove': _NAME_PATTERN.findall,
+    'int': _to_int,
+    'int-list': lambda rest: [int(elem) for elem in rest.split()],
+    'float-list': lambda rest: np.array(rest.split(), dtype=float),
+    'float': float,
+    'numpy-dtype': _to_numpy_dtype,
+}
+
+
+def _header_parser(method):
+    """
+    Returns the conversion function for a method from bladed_definitions.py.
+    """
+    parser = _HEADER_PARSERS.get(method)
+    if parser is None:
+        raise NotImplementedError('Unknown conversion type: "' + method + '"')
+    return parser
+
 
 class SkipLine(NotImplementedError):
     """
@@ -21,8 +85,15 @@ class SkipLine(NotImplementedError):
 class BladedResult:
     """
     Interface for Bladed binary data.
+
+    Unless unload is set, the binary result files are memory-mapped and stay mapped as long as the instance or
+    any view returned by get() references them. On Windows, a mapped file cannot be replaced or deleted (e.g. by
+    re-running a simulation into the same result directory): call close() and drop the views first.
     """
 
+    # memory maps of binary files, shared by all instances as long as one of them holds a reference
+    _mmap_cache = weakref.WeakValueDictionary()
+
     def __init__(self, result_dir, result_prefix, unload=False):
         """
         Parameters
@@ -32,7 +103,8 @@ class BladedResult:
         result_prefix: str
             Result file prefix
         unload: boolean
-            flag, if set the binary data is de-referenced after each read (to save memory)
+            flag, if set the binary data is de-referenced after each read (to save memory), so the binary
+            files are not kept open
         """
         self.result_dir = result_dir
         self.result_prefix = result_prefix
@@ -42,23 +114,71 @@ class BladedResult:
         self.supported_keywords = bladed_definitions.supported_keywords
         self.header_file_names = None
         self.results = None
+        # dataset name -> (header name, variable index, number of dimensions), built by scan()
+        self._dataset_index = None
+        # header name -> binary data (memory map), kept apart from the header dicts
+        self._data_cache = dict()
+        # header name -> numpy shape of the binary data, built by scan()
+        self._np_shapes = dict()
 
     def scan(self):
         """
         Reads the header files (%*) and creates a list of known variables. Results are not read here.
 
-        The header file name is used as top-level key in the result dictionary.
+        The header file name is used as top-level key in the result dictionary. The header values are converted as
+        specified in bladed_definitions, so they are not JSON-serializable as they are: FORMAT is a numpy.dtype and
+        float lists (e.g. AXIVAL) are numpy arrays.
         """
         # find the matching header files
         path_pattern = os.path.join(self.result_dir, self.result_prefix + '.%*')
         self.header_file_names = glob.glob(path_pattern)
         if not self.header_file_names:
             raise FileNotFoundError('No header files found, check path')
-        self.results = dict()
-        for header_file_name in self.header_file_names:
-            with open(header_file_name) as file_object:
-                self.results[header_file_name] = self._read_header(file_object, self.supported_keywords)
-            self.results[header_file_name]['data'] = None
+        if len(self.header_file_names) > 1:
+            # header files are independent of each other and file IO releases the GIL
+            with ThreadPoolExecutor(max_workers=min(8, len(self.header_file_names))) as executor:
+                self.results = dict(executor.map(self._parse_one_header, self.header_file_names))
+        else:
+            # not worth starting threads for
+            self.results = dict(map(self._parse_one_header, self.header_file_names))
+        self._data_cache = dict()
+        # numpy shape of the binary data (C order: the first dimension in the header varies fastest)
+        self._np_shapes = {header_file_name: tuple(header['DIMENS'])[::-1]
+                           for header_file_name, header in self.results.items() if 'DIMENS' in header}
+
+        # reverse index for _find_dataset
+        self._dataset_index = dict()
+        for header_file_name, header in self.results.items():
+            for i, name in enumerate(header.get('VARIAB', [])):
+                # the first occurrence wins, in the order the headers were found
+                self._dataset_index.setdefault(name, (header_file_name, i, header.get('NDIMENS')))
+
+    def close(self):
+        """
+        Releases the memory maps held by this instance, so the binary result files can be replaced or deleted
+        (required on Windows). Views returned by get() keep their file mapped until they are dropped as well.
+        The results stay available: data is mapped again on the next access.
+        """
+        self._data_cache = dict()
+
+    def _parse_one_header(self, header_file_name):
+        """
+        Reads one header file.
+
+        Parameters
+        ----------
+        header_file_name: str
+            Path of the header file (%*)
+
+        Returns
+        ----------
+        tuple (header name, header dict)
+        """
+        # the file is read in one go, so the buffering layer is not needed
+        with open(header_file_name, 'rb', buffering=0) as file_object:
+            text = file_object.readall().decode('latin-1')
+        header = self._parse_header(text, self.supported_keywords)
+        return header_file_name, header
 
     @staticmethod
     def _read_header(file_object, supported_keywords):
@@ -77,20 +197,37 @@ class BladedResult:
         result: dict
             The processed header file (filtered and transformed key/value pairs)
         """
-        lines = file_object.readlines()
-        lines = [line.replace('\n', '') for line in lines]
+        return BladedResult._parse_header(file_object.read(), supported_keywords)
+
+    @staticmethod
+    def _parse_header(text, supported_keywords):
+        """
+        Parses Bladed header file content into a dict.
+
+        Parameters
+        ----------
+        text: str
+            Full content of the header file
+        supported_keywords: dict
+            definition of supported keywords, a map of keywords and the requested type transformations
 
+        Returns
+        ----------
+        result: dict
+            The processed header file (filtered and transformed key/value pairs)
+        """
+        if '\r' in text:
+            # universal newlines (as in text mode): CRLF and bare CR line endings
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
         result = dict()
-        for line in lines:
-            try:
-                key, value = BladedResult._parse_header_line(line, supported_keywords)
-                result[key] = value
-            except SkipLine:
-                # expected if line does not split into two parts
-                pass
-            except KeyError:
-                # expected if line does not start with one of the known keywords
-                pass
+        # same logic as _parse_header_line, but in one pass over the whole file: lines that do not split into
+        # two parts have no keyword (None), lines that do not start with one of the known keywords are skipped
+        for match in _HEADER_LINE_PATTERN.finditer(text):
+            keyword, rest = match.groups()
+            method = supported_keywords.get(keyword)
+            if method is None:
+                continue
+            result[keyword] = _header_parser(method)(rest.rstrip())
 
         return result
 
@@ -108,49 +245,18 @@ class BladedResult:
 
         Returns
         ----------
-        key and value as tuple
+        key and value as tuple, None if the line does not start with one of the known keywords
         """
-        # this will fail if
-        split_str = line.split(maxsplit=1)
-        if len(split_str) == 1:
+        # split off keyword and rest in one go, the keyword is None if the line does not split into two parts
+        keyword, rest = _HEADER_LINE_PATTERN.match(line).groups()
+        if keyword is None:
             raise SkipLine
 
-        keyword = split_str[0]
-        rest = split_str[1]
-
-        # select method to extract
-        # will raise a KeyError exception (desired) and thus the line is skipped
-        method = supported_keywords[keyword]
-        if method == 'string':
-            value = rest
-        elif method == 'string-remove':
-            value = rest.replace("'", "")
-        elif method == 'string-list':
-            value = rest.split(' ')
-        elif method == 'string-list-remove':
-            # match the names enclosed by ''
-            value = re.findall(r"'([\w\s\-()/.]+)'", rest)
-        elif method == 'int':
-            value = int(rest)
-        elif method == 'int-list':
-            value = [int(elem) for elem in rest.split()]
-        elif method == 'float-list':
-            value = [float(elem) for elem in rest.split()]
-        elif method == 'float':
-            value = float(rest)
-        elif method == 'numpy-dtype':
-            if rest == 'R*4':
-                value = '<f4'
-            elif rest == 'R4':
-                value = '<f4'
-            elif rest == 'R*8':
-                value = '<f8'
-            elif rest == 'I*4':
-                value = '<i4'
-            else:
-                raise ValueError('Unknown type in Bladed header: ' + rest)
-        else:
-            raise NotImplementedError('Unknown conversion type: "' + method + '"')
+        # select method to extract, unknown keywords are expected and the line is skipped
+        method = supported_keywords.get(keyword)
+        if method is None:
+            return None
+        value = _header_parser(method)(rest.rstrip())
 
         return keyword, value
 
@@ -169,36 +275,75 @@ class BladedResult:
         tuple (header name, slice)
             Name of the header file (which is the top-level dict key)
         """
-        for key in self.results:
-            if 'VARIAB' not in self.results[key]:
-                continue
-            if dataset_name in self.results[key]['VARIAB']:
-                if self.results[key]['NDIMENS'] == 2:
-                    i = self.results[key]['VARIAB'].index(dataset_name)
-                    dataset_slice = slice(None), slice(i, i+1)
-                elif self.results[key]['NDIMENS'] == 3:
-                    i = self.results[key]['VARIAB'].index(dataset_name)
-                    dataset_slice = slice(None), slice(None), slice(i, i+1)
-                else:
-                    raise NotImplementedError('Current implementation supports 2D or 3D data only')
-                return key, dataset_slice
-        raise KeyError('Dataset name not found in any of the known headers')
+        try:
+            key, i, ndims = self._dataset_index[dataset_name]
+        except KeyError:
+            raise KeyError('Dataset name not found in any of the known headers')
+        # integer index on the variable axis: the extracted data has one dimension less
+        if ndims == 2:
+            dataset_slice = slice(None), i
+        elif ndims == 3:
+            dataset_slice = slice(None), slice(None), i
+        else:
+            raise NotImplementedError('Current implementation supports 2D or 3D data only')
+        return key, dataset_slice
+
+    def _map_binary(self, header_file_name):
+        """
+        Maps the binary data associated with one header file into memory (read-only). Instances reading the same
+        (unchanged) file share one memory map.
+
+        Parameters
+        ----------
+        header_file_name: str
+            Name of the header file, for which data is mapped.
+
+        Returns
+        ----------
+        numpy.memmap
+        """
+        binary_file_path = os.path.join(self.result_dir, self.results[header_file_name]['FILE'])
+        dtype = self.results[header_file_name]['FORMAT']
+        shape = self._np_shapes[header_file_name]
+        # the file identity is part of the key, so a result file that has been rewritten (e.g. by a new
+        # simulation with the same prefix) is mapped again instead of returning the old data
+        stat = os.stat(binary_file_path)
+        key = os.path.realpath(binary_file_path), stat.st_ino, stat.st_size, stat.st_mtime_ns, dtype, shape
+        data = self._mmap_cache.get(key)
+        if data is None:
+            # memory mapping: only the pages touched by a slice are actually read from disk
+            data = np.memmap(binary_file_path, dtype=dtype, mode='r', shape=shape)
+            self._mmap_cache[key] = data
+        return data
 
     def _load_dataset(self, header_file_name):
         """
-        Reads the binary data associated with one header file.
+        Reads the binary data associated with one header file (as memory map).
 
         Parameters
         ----------
         header_file_name: str
             Name of the header file, for which data is loaded.
         """
-        binary_file_path = os.path.join(self.result_dir, self.results[header_file_name]['FILE'])
-        shape = [x for x in reversed(self.results[header_file_name]['DIMENS'])]
-        with open(binary_file_path, 'rb') as file_object:
-            file_content = file_object.read()
-            self.results[header_file_name]['data'] = \
-                np.frombuffer(file_content, dtype=self.results[header_file_name]['FORMAT']).reshape(shape)
+        self._data_cache[header_file_name] = self._map_binary(header_file_name)
+
+    def _load_column(self, header_file_name, dataset_slice):
+        """
+        Reads only the data of one variable from the binary file, without keeping any reference to the file.
+
+        Parameters
+        ----------
+        header_file_name: str
+            Name of the header file, for which data is loaded.
+        dataset_slice: tuple
+            Index of the variable, as generated by _find_dataset()
+
+        Returns
+        ----------
+        numpy.ndarray
+            Compact copy of the variable's data
+        """
+        return np.array(self._map_binary(header_file_name)[dataset_slice])
 
     def __getitem__(self, item):
         """
@@ -212,23 +357,79 @@ class BladedResult:
         Returns
         ----------
         array-like
-            The corresponding data from the binary result file.
+            The corresponding data from the binary result file (a copy, see also get()).
         """
-        # find the corresponding header file
-        header_file_name, dataset_slice = self._find_dataset(item)
+        return self.get(item, copy=True)
 
-        # load data from binary result file if not present
-        if self.results[header_file_name]['data'] is None:
-            self._load_dataset(header_file_name)
+    def get(self, item, copy=False):
+        """
+        Access to data for one item (e.g. time data). Reads the data from the binary file, if not
+        yet present.
 
-        # make slice according to dimensions
-        data = np.copy(self.results[header_file_name]['data'][dataset_slice])
+        Parameters
+        ----------
+        item: str
+            Name of the dataset to access (as showing up in Bladed and the header file)
+        copy: boolean
+            flag, if not set (and unload is not set) a read-only view into the memory-mapped file is returned
+        Returns
+        ----------
+        array-like
+            The corresponding data from the binary result file. A view keeps the binary file mapped (and
+            locked on Windows) while it is referenced, see close().
+        """
+        # find the corresponding header file
+        header_file_name, dataset_slice = self._find_dataset(item)
 
-        # limit memory consumption by removing the reference to the binary data
         if self.unload is True:
-            self.results[header_file_name]['data'] = None
+            # limit memory consumption: only the requested variable is read and no reference to the binary data kept
+            data = self._load_column(header_file_name, dataset_slice)
+        else:
+            # load data from binary result file if not present
+            if header_file_name not in self._data_cache:
+                self._load_dataset(header_file_name)
+            # make slice according to dimensions
+            data = self._data_cache[header_file_name][dataset_slice]
+            data = np.copy(data) if copy else np.asarray(data)
 
         if self.results[header_file_name]['NDIMENS'] == 3:
             return data, self.results[header_file_name]
         else:
             return data
+
+    def get_shared(self, item):
+        """
+        Describes where the data of one item is located in the binary result file. The description can be
+        passed to other processes (e.g. multiprocessing workers), which map the file themselves with
+        open_shared() instead of receiving a pickled copy of the data.
+
+        Parameters
+        ----------
+        item: str
+            Name of the dataset to access (as showing up in Bladed and the header file)
+        Returns
+        ----------
+        tuple (binary file path, dtype, shape, slice)
+            Picklable description of the dataset
+        """
+        header_file_name, dataset_slice = self._find_dataset(item)
+        header = self.results[header_file_name]
+        binary_file_path = os.path.join(self.result_dir, header['FILE'])
+        return binary_file_path, header['FORMAT'], self._np_shapes[header_file_name], dataset_slice
+
+    @staticmethod
+    def open_shared(shared):
+        """
+        Maps a dataset described by get_shared() into memory.
+
+        Parameters
+        ----------
+        shared: tuple
+            Description as returned by get_shared()
+        Returns
+        ----------
+        array-like
+            Read-only view of the dataset in the memory-mapped binary result file
+        """
+        binary_file_path, dtype, shape, dataset_slice = shared
+        return np.asarray(np.memmap(binary_file_path, dtype=dtype, mode='r', shape=shape)[dataset_slice])
@@ -4,7 +4,11 @@ All tests for the binary reading
 
 import numpy as np
 import os
+import gc
 import json
+import pickle
+import shutil
+import sys
 # python3 only:
 import io
 import pytest
@@ -42,6 +46,20 @@ def test_parse_header_line_formatting():
     k, v = BladedResult._parse_header_line('RECL\t  4', bladed_definitions.supported_keywords)
     assert k == 'RECL'
     assert v == 4
+    # leading whitespace
+    k, v = BladedResult._parse_header_line(' \tRECL 4', bladed_definitions.supported_keywords)
+    assert k == 'RECL'
+    assert v == 4
+    # other whitespace as separator
+    k, v = BladedResult._parse_header_line('RECL\x0c4', bladed_definitions.supported_keywords)
+    assert k == 'RECL'
+    assert v == 4
+    # the same applies when reading a whole header
+    header = io.StringIO(' RECL\x0c4\n  NDIMENS\t2\r\n')
+    assert BladedResult._read_header(header, bladed_definitions.supported_keywords) == {'RECL': 4, 'NDIMENS': 2}
+    # bare CR line endings
+    header = io.StringIO('RECL\t4\rNDIMENS\t2\r', newline='')
+    assert BladedResult._read_header(header, bladed_definitions.supported_keywords) == {'RECL': 4, 'NDIMENS': 2}
 
 
 def test_parse_header_line_failures():
@@ -56,9 +74,8 @@ def test_parse_header_line_failures():
     with pytest.raises(SkipLine):
         _, _ = BladedResult._parse_header_line('ABC', bladed_definitions.supported_keywords)
 
-    # invalid line with unknown keyword
-    with pytest.raises(KeyError):
-        _, _ = BladedResult._parse_header_line('A B', bladed_definitions.supported_keywords)
+    # line with unknown keyword is skipped
+    assert BladedResult._parse_header_line('A B', bladed_definitions.supported_keywords) is None
 
     # invalid value format
     with pytest.raises(ValueError):
@@ -149,6 +166,9 @@ def test_parse_header_line_type_failure():
     # malformed integer
     with pytest.raises(ValueError):
         _, _ = BladedResult._parse_header_line('FORMAT	I*3', bladed_definitions.supported_keywords)
+    # malformed list of floats
+    with pytest.raises(ValueError):
+        _, _ = BladedResult._parse_header_line('AXIVAL	1.0 abc', bladed_definitions.supported_keywords)
     # use non-standard dict of keywords to provoke missing implementation error
     with pytest.raises(NotImplementedError):
         _, _ = BladedResult._parse_header_line('FORMAT	I*3', {'FORMAT': 'NON_EXISTING_METHOD'})
@@ -204,9 +224,163 @@ def test_bladed_result_scan(bladed_result):
         expected_header = json.load(json_file)
     assert key_name in bladed_result.results
     header = bladed_result.results[key_name]
-    assert header['data'] is None
+    assert 'data' not in header
+    assert not [key for key in header if key.startswith('_')]
 
     for key, value in expected_header.items():
         # we don't know the data type, for now equality works for all items
         cmp = value == header[key]
         assert cmp
+
+
+def test_bladed_result_shared(bladed_result):
+    """
+    Test for BladedResult.get_shared() and BladedResult.open_shared()
+
+    Purpose: Checks if the data mapped from the (pickled) description matches the regular access
+
+    :param bladed_result: BladedResult object from test fixture
+    :return: None
+    """
+    bladed_result.scan()
+    shared = pickle.loads(pickle.dumps(bladed_result.get_shared('Electrical power')))
+    data = BladedResult.open_shared(shared)
+    assert np.array_equal(data, bladed_result['Electrical power'])
+    assert not data.flags.writeable
+
+
+def test_bladed_result_shared_memory_map():
+    """
+    Test for BladedResult._map_binary()
+
+    Purpose: Checks if instances reading the same result files share one memory map
+    :return: None
+    """
+    result_dir = os.path.join('pyBladed', 'results', 'example_data', '2D')
+    bladed_results = [BladedResult(result_dir, 'powprod_12ms') for _ in range(2)]
+    for bladed_result in bladed_results:
+        bladed_result.scan()
+    maps = [bladed_result._map_binary(os.path.join(result_dir, 'powprod_12ms.%06'))
+            for bladed_result in bladed_results]
+    assert maps[0] is maps[1]
+
+
+def test_bladed_result_get(bladed_result):
+    """
+    Test for BladedResult.get()
+
+    Purpose: Checks that views are only returned on request and do not differ from the copied data
+
+    :param bladed_result: BladedResult object from test fixture
+    :return: None
+    """
+    bladed_result.scan()
+    data = bladed_result['Electrical power']
+    view = bladed_result.get('Electrical power')
+    assert np.array_equal(data, view)
+    assert data.flags.writeable
+    assert not view.flags.writeable
+
+
+def test_bladed_result_close(tmp_path):
+    """
+    Test for BladedResult.close()
+
+    Purpose: Checks that no memory map of the binary file is left after close() and that data can be read again
+    :param tmp_path: temporary directory from pytest fixture
+    :return: None
+    """
+    source_dir = os.path.join('pyBladed', 'results', 'example_data', '2D')
+    for file_name in ['powprod_12ms.%06', 'powprod_12ms.$06']:
+        shutil.copy(os.path.join(source_dir, file_name), str(tmp_path))
+
+    binary_file_path = os.path.join(str(tmp_path), 'powprod_12ms.$06')
+
+    result = BladedResult(str(tmp_path), 'powprod_12ms')
+    result.scan()
+    data = result['Electrical power']
+    assert result._data_cache
+    result.close()
+    gc.collect()
+    assert not result._data_cache
+    assert not [key for key in BladedResult._mmap_cache.keys() if key[0] == os.path.realpath(binary_file_path)]
+    # the file is no longer mapped, so it can be removed (also on Windows); the copy is still valid
+    os.remove(binary_file_path)
+    assert data.flags.writeable and len(data) > 0
+
+
+# Windows cannot replace a file that is still memory-mapped, which is the very situation tested here
+@pytest.mark.skipif(sys.platform == 'win32', reason='a memory-mapped file cannot be replaced on Windows')
+def test_bladed_result_rewritten_file(tmp_path):
+    """
+    Test for BladedResult._map_binary()
+
+    Purpose: Checks that a result file rewritten while another instance still maps it is read again
+    :param tmp_path: temporary directory from pytest fixture
+    :return: None
+    """
+    source_dir = os.path.join('pyBladed', 'results', 'example_data', '2D')
+    for file_name in ['powprod_12ms.%06', 'powprod_12ms.$06']:
+        shutil.copy(os.path.join(source_dir, file_name), str(tmp_path))
+    binary_file_path = os.path.join(str(tmp_path), 'powprod_12ms.$06')
+
+    old_result = BladedResult(str(tmp_path), 'powprod_12ms')
+    old_result.scan()
+    old_data = old_result.get('Electrical power')
+
+    # replace the binary file by new content of the same size (as a new simulation run does)
+    new_content = np.full(os.path.getsize(binary_file_path) // 4, 42.0, dtype='<f4')
+    new_content.tofile(binary_file_path + '.new')
+    os.replace(binary_file_path + '.new', binary_file_path)
+
+    new_result = BladedResult(str(tmp_path), 'powprod_12ms')
+    new_result.scan()
+    assert np.all(new_result.get('Electrical power') == 42.0)
+    assert not np.all(old_data == 42.0)
+
+
+@pytest.mark.parametrize('dimension, dataset_name', [('2D', 'Electrical power'), ('3D', 'Blade 1 x-position')])
+def test_bladed_result_unload(dimension, dataset_name):
+    """
+    Test for BladedResult.get() with unload set (BladedResult._load_column())
+
+    Purpose: Checks that unloading extracts the same data and keeps no reference to the binary data
+    :param dimension: example data set
+    :param dataset_name: name of a dataset in the example data set
+    :return: None
+    """
+    result_dir = os.path.join('pyBladed', 'results', 'example_data', dimension)
+    results = [BladedResult(result_dir, 'powprod_12ms', unload=unload) for unload in [False, True]]
+    extract = list()
+    for bladed_result in results:
+        bladed_result.scan()
+        data = bladed_result[dataset_name]
+        extract.append(data[0] if dimension == '3D' else data)
+    expected, unloaded = extract
+    assert unloaded.shape == expected.shape
+    assert np.array_equal(unloaded, expected)
+    assert unloaded.flags.c_contiguous
+    assert results[1]._data_cache == {}
+
+
+def test_bladed_result_scan_cr_line_endings(tmp_path):
+    """
+    Test for BladedResult.scan()
+
+    Purpose: Checks that header files with bare CR line endings are read like with LF line endings
+    :param tmp_path: temporary directory from pytest fixture
+    :return: None
+    """
+    source_dir = os.path.join('pyBladed', 'results', 'example_data', '2D')
+    shutil.copy(os.path.join(source_dir, 'powprod_12ms.$06'), str(tmp_path))
+    with open(os.path.join(source_dir, 'powprod_12ms.%06'), 'rb') as file_object:
+        content = file_object.read().replace(b'\r\n', b'\n').replace(b'\n', b'\r')
+    with open(os.path.join(str(tmp_path), 'powprod_12ms.%06'), 'wb') as file_object:
+        file_object.write(content)
+
+    expected = BladedResult(source_dir, 'powprod_12ms')
+    expected.scan()
+    bladed_result = BladedResult(str(tmp_path), 'powprod_12ms')
+    bladed_result.scan()
+    assert list(bladed_result.results.values()) == list(expected.results.values())
+    assert np.array_equal(bladed_result['Electrical power'], expected['Electrical power'])
@@ -1,10 +1,11 @@
 """
-Loading a large number of large result files causes a MEMORY_ERROR, if all data is kept in memory. De-referencing it is
-of cause slower.
+Loading a large number of large result files. The binary files are memory-mapped and the maps are shared between
+instances, so keeping the data referenced does not multiply the memory consumption. De-referencing it keeps only the
+extracted variables in memory.
 """
 
 import os
-import pytest
+import numpy as np
 # from memory_profiler import profile
 
 # specimen
@@ -31,12 +32,30 @@ def load_large(num_loads, unload):
                bladed_results]
 
 
-def test_load_large_fail():
+def test_load_large_shared():
     """
-    Will result in a memory error because all data read from the result file stays in memory
+    Without unloading, all instances share one read-only memory map of the result file, so the data stays on disk
+    (page cache) instead of being held in memory once per instance
     """
-    with pytest.raises(MemoryError):
-        load_large(num_loads=1000, unload=False)
+    bladed_results = list()
+    for i in range(1000):
+        bladed_results.append(
+            BladedResult(os.path.join('pyBladed', 'results', 'example_data', 'large'), 'stab_analysis_run'))
+
+    for bladed_result in bladed_results:
+        bladed_result.scan()
+
+    name = 'Blade 1 x-deflection (perpendicular to rotor plane)'
+    extract = [bladed_result.get(name)[0] for bladed_result in bladed_results]
+
+    maps = {id(data) for bladed_result in bladed_results for data in bladed_result._data_cache.values()}
+    assert len(maps) == 1
+    reference = BladedResult(os.path.join('pyBladed', 'results', 'example_data', 'large'), 'stab_analysis_run',
+                             unload=True)
+    reference.scan()
+    expected = reference[name][0]
+    for data in extract:
+        assert np.array_equal(data, expected)
 
 
 def test_load_large_success():